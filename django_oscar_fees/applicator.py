@@ -1,16 +1,69 @@
 import logging
+from functools import lru_cache
 from itertools import chain
 
 from django.contrib import messages
-from django.db.models import Q
+from django.db.models import Count, Q
 from django.urls import reverse
 from django.utils.timezone import now
 
-from .models import ConditionalFee
+from .fees import reset_fees
+from .models import ConditionalFee, OrderFee
 from .results import FeeApplications
 
 logger = logging.getLogger('oscar.offers')
 
+# The fields needed to apply a fee to a basket and render it. The name and
+# description are shown in the basket, the max_*/total fields are used by
+# ConditionalFee.get_max_applications and the condition/fee fields are
+# copied when creating their proxy instances.
+FEE_APPLICATION_FIELDS = (
+    'name', 'description', 'offer_type', 'status',
+    'max_global_applications', 'max_user_applications',
+    'max_basket_applications', 'max_fee', 'total_fee', 'num_applications',
+    'condition__range', 'condition__type', 'condition__value',
+    'condition__proxy_class',
+    'fee__range', 'fee__type', 'fee__value', 'fee__proxy_class',
+)
+
+
+def get_cutoff_minute():
+    """
+    Return the current time truncated to the minute, used to share site fee
+    lookups between requests.
+    """
+    return now().replace(second=0, microsecond=0)
+
+
+def get_site_fees_queryset(cutoff):
+    """
+    Return the queryset of site fees active at ``cutoff``.
+
+    Building the filter is only done once per minute, every call returns a
+    fresh clone of it.
+    """
+    return _get_site_fees_queryset(cutoff).all()
+
+
+@lru_cache(maxsize=4)
+def _get_site_fees_queryset(cutoff):
+    # Shared between callers, so this queryset must never be evaluated
+    date_based = Q(
+        Q(start_datetime__lte=cutoff),
+        Q(end_datetime__gte=cutoff) | Q(end_datetime=None),
+    )
+
+    nondate_based = Q(start_datetime=None, end_datetime=None)
+
+    qs = ConditionalFee.objects.filter(
+        date_based | nondate_based,
+        offer_type=ConditionalFee.SITE,
+        status=ConditionalFee.OPEN)
+    # Using select_related with the condition/benefit ranges doesn't seem
+    # to work.  I think this is because both the related objects have the
+    # FK to range with the same name.
+    return qs.select_related('condition', 'fee').only(*FEE_APPLICATION_FIELDS)
+
 
 class Applicator(object):
 
@@ -32,20 +85,31 @@ class Applicator(object):
 
     def apply_fees(self, basket, fees):
         applications = FeeApplications()
+        reset_fees(basket)
+        if not basket.id or basket.is_empty:
+            basket.fee_applications = applications
+            return
+
+        # Fees are needed twice here, get_fees already returns a list but
+        # other iterables are accepted as well
+        if not isinstance(fees, list):
+            fees = list(fees)
+        user_applications = self.get_user_application_counts(
+            basket.owner, fees)
         for fee in fees:
+            max_applications = fee.get_max_applications(
+                basket.owner, user_applications.get(fee.fee_id, 0))
             num_applications = 0
             # Keep applying the offer until either
             # (a) We reach the max number of applications for the offer.
             # (b) The benefit can't be applied successfully.
-            while num_applications < fee.get_max_applications(basket.owner):
+            while num_applications < max_applications:
                 result = fee.apply_fee(basket)
                 num_applications += 1
                 if not result.is_successful:
                     break
 
                 applications.add(fee, result)
-
-                basket.total_test += 1
                 if result.is_final:
                     break
 
@@ -53,6 +117,18 @@ class Applicator(object):
         # rendered in templates
         basket.fee_applications = applications
 
+    def get_user_application_counts(self, user, fees):
+        """
+        Return a dict mapping fee IDs to the number of times the given user
+        has had them applied, using a single query for all fees.
+        """
+        fee_ids = [fee.fee_id for fee in fees if fee.max_user_applications]
+        if not user or not fee_ids:
+            return {}
+        counts = OrderFee.objects.filter(order__user=user, fee_id__in=fee_ids)\
+            .values('fee_id').annotate(count=Count('id'))
+        return {c['fee_id']: c['count'] for c in counts}
+
     def get_fees(self, basket, user=None, request=None):
         """
         Return all fees to apply to the basket.
@@ -61,32 +137,30 @@ class Applicator(object):
         sophisticated behaviour.  For instance, you could load extra offers
         based on the session or the user type.
         """
-        site_fees = self.get_site_fees()
+        site_fees = self.get_site_fees(request)
         user_fees = self.get_user_fees(user)
         session_fees = self.get_session_fees(request)
 
         return list(chain(session_fees, user_fees, site_fees))
 
-    def get_site_fees(self):
+    def get_site_fees(self, request=None):
         """
         Return site offers that are available to all users
+
+        The result is stored on the request so that rendering the basket
+        several times within one request/response cycle only queries once.
         """
-        cutoff = now()
-        date_based = Q(
-            Q(start_datetime__lte=cutoff),
-            Q(end_datetime__gte=cutoff) | Q(end_datetime=None),
-        )
-
-        nondate_based = Q(start_datetime=None, end_datetime=None)
-
-        qs = ConditionalFee.objects.filter(
-            date_based | nondate_based,
-            offer_type=ConditionalFee.SITE,
-            status=ConditionalFee.OPEN)
-        # Using select_related with the condition/benefit ranges doesn't seem
-        # to work.  I think this is because both the related objects have the
-        # FK to range with the same name.
-        return qs.select_related('condition', 'fee')
+        if request is None:
+            return self._get_site_fees()
+        if hasattr(request, '_oscar_site_fees'):
+            return request._oscar_site_fees
+
+        request._oscar_site_fees = self._get_site_fees()
+        return request._oscar_site_fees
+
+    def _get_site_fees(self):
+        qs = get_site_fees_queryset(get_cutoff_minute())
+        return list(qs)
 
     def get_user_fees(self, user):
         """
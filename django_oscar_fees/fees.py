@@ -1,5 +1,7 @@
+import logging
 from decimal import Decimal as D
 
+from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
 
 from oscar.apps.offer import conditions, utils
@@ -7,41 +9,48 @@ from oscar.templatetags.currency_filters import currency
 
 from .models import Fee
 from .results import BasketFee, ZERO_FEE
+from .utils import (  # noqa (line helpers used to live in this module)
+    apply_fee_to_line, apply_fee_to_lines, get_fee_amount, reset_line_fees)
 
 __all__ = [
     'PercentageFee', 'AbsoluteFee'
 ]
 
+logger = logging.getLogger('oscar.offers')
 
-def apply_fee_to_line(line, line_fee, quantity):
+_ZERO = D('0.00')
+
+
+def get_total_fees_amount(basket):
     """
-    Apply a given discount to the passed line
+    Return the total fee amount applied to the passed basket
     """
-    # Set if not already
-    if not hasattr(line, '_fee_amount'):
-        line._fee_amount = D('0.00')
-    if not hasattr(line, '_fee_quantity'):
-        line._fee_quantity = 0
+    return basket.__dict__.get('_total_fees_amount', _ZERO)
 
-    # Apply
-    line._fee_amount += line_fee
-    line._fee_quantity += int(quantity)
+
+def reset_fees(basket):
+    """
+    Clear the fees applied to the passed basket and its lines, so fees of an
+    earlier application don't add up with the new ones
+    """
+    basket._fees = []
+    basket._total_fees_amount = _ZERO
+    for line in basket.all_lines():
+        reset_line_fees(line)
 
 
 def apply_fee_to_basket(basket, fee, fees_amount, quantity):
     """
     Apply a given discount to the passed basket
     """
-    # Set if not already
-    if not hasattr(basket, '_total_fees_amount'):
-        basket._total_fees_amount = D('0.00')
-    if not hasattr(basket, '_fees'):
-        basket._fees = []
-    print('Add fee: €', fees_amount)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug('Add fee: €%s', fees_amount)
 
-    # Apply
-    basket._fees.append(fee)
-    basket._total_fees_amount += fees_amount
+    # Set if not already
+    attrs = basket.__dict__
+    attrs.setdefault('_fees', []).append(fee)
+    attrs['_total_fees_amount'] = (
+        attrs.get('_total_fees_amount', _ZERO) + fees_amount)
 
 
 class PercentageFee(Fee):
@@ -113,36 +122,31 @@ class AbsoluteFee(Fee):
         if not line_tuples:
             return ZERO_FEE
 
-        #
-        # # Determine the lines to consume
+        # Determine the lines to consume
         num_permitted = int(condition.value)
+        if isinstance(condition, conditions.CoverageCondition):
+            def get_quantity(line):
+                return 1
+        else:
+            def get_quantity(line):
+                return line.quantity
+
         num_affected = 0
-        # value_affected = D('0.00')
         covered_lines = []
         for price, line in line_tuples:
-            if isinstance(condition, conditions.CoverageCondition):
-                quantity_affected = 1
-            else:
-                quantity_affected = line.quantity
+            quantity_affected = get_quantity(line)
             num_affected += quantity_affected
-            # value_affected += quantity_affected * price
-            covered_lines.append((price, line, quantity_affected))
+            covered_lines.append((line, quantity_affected))
             if num_affected >= num_permitted:
                 break
 
-        # Apply discount to the affected lines
-        # Apply discount to the affected lines
-        fee_applied = D('0.00')
-        last_line = covered_lines[-1][1]
-        for price, line, quantity in covered_lines:
-            if line == last_line:
-                # If last line, we just take the difference to ensure that
-                # rounding doesn't lead to an off-by-one error
-                line_fee = fee_amount - fee_applied
-            else:
-                line_fee = self.round((fee_amount * quantity) / num_affected)
-            apply_fee_to_line(line, line_fee, quantity)
-            fee_applied += line_fee
+        # Apply fee to the affected lines. Unless the rounding is customised,
+        # this can be done in cents without any Decimal arithmetic.
+        if type(self).round is Fee.round and \
+                not hasattr(settings, 'OSCAR_OFFER_ROUNDING_FUNCTION'):
+            apply_fee_to_lines(covered_lines, fee_amount)
+        else:
+            apply_fee_to_lines(covered_lines, fee_amount, self.round)
 
         apply_fee_to_basket(basket, self, fee_amount, 1)
         return BasketFee(fee_amount)
@@ -10,4 +10,4 @@ class ActiveFeeManager(models.Manager):
         cutoff = now()
         return super(ActiveFeeManager, self).get_queryset().filter(
             models.Q(end_datetime__gte=cutoff) | models.Q(end_datetime=None),
-            start_datetime__lte=cutoff).filter(status=self.model.OPEN)
+            start_datetime__lte=cutoff, status=self.model.OPEN)
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_oscar_fees', '0002_auto_20170811_1403'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='conditionalfee',
+            index_together=set([('status', 'start_datetime', 'end_datetime')]),
+        ),
+    ]
@@ -1,3 +1,5 @@
+from decimal import Decimal as D
+
 
 class PaymentDetailsMixin:
     def build_submission(self, **kwargs):
@@ -12,7 +14,7 @@ class PaymentDetailsMixin:
         self._fees = []
         if hasattr(self.request.basket, '_fees') and submission['order_total']:
             self._fees = self.request.basket._fees
-            for fee in self._fees:
-                submission['order_total'].excl_tax += fee.value
-                submission['order_total'].incl_tax += fee.value
+            total_fee = sum((fee.value for fee in self._fees), D('0.00'))
+            submission['order_total'].excl_tax += total_fee
+            submission['order_total'].incl_tax += total_fee
         return submission
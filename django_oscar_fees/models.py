@@ -129,6 +129,7 @@ class ConditionalFee(models.Model):
     class Meta:
         app_label = 'django_oscar_fees'
         ordering = ['-date_created']
+        index_together = [('status', 'start_datetime', 'end_datetime')]
         verbose_name = _("Conditional fee")
         verbose_name_plural = _("Conditional fees")
 
@@ -206,10 +207,13 @@ class ConditionalFee(models.Model):
             return ZERO_FEE
         return self.fee.proxy().apply(basket, self.condition.proxy(), self)
 
-    def get_max_applications(self, user=None):
+    def get_max_applications(self, user=None, num_user_applications=None):
         """
         Return the number of times this fee can be applied to a basket for a
         given user.
+
+        The number of times the user already had this fee applied can be
+        passed in when it was looked up beforehand.
         """
         if self.max_fee and self.total_fee >= self.max_fee:
             return 0
@@ -218,8 +222,10 @@ class ConditionalFee(models.Model):
         # when there are not other caps.
         limits = [10000]
         if self.max_user_applications and user:
+            if num_user_applications is None:
+                num_user_applications = self.get_num_user_applications(user)
             limits.append(max(0, self.max_user_applications -
-                          self.get_num_user_applications(user)))
+                          num_user_applications))
         if self.max_basket_applications:
             limits.append(self.max_basket_applications)
         if self.max_global_applications:
@@ -228,12 +234,8 @@ class ConditionalFee(models.Model):
         return min(limits)
 
     def get_num_user_applications(self, user):
-        raise NotImplementedError('ConditionalFee.get_num_user_applications')
-        OrderDiscount = get_model('order', 'OrderDiscount')
-        aggregates = OrderDiscount.objects.filter(offer_id=self.id,
-                                                  order__user=user)\
-            .aggregate(total=models.Sum('frequency'))
-        return aggregates['total'] if aggregates['total'] is not None else 0
+        return OrderFee.objects.filter(fee_id=self.fee_id,
+                                       order__user=user).count()
 
     def shipping_discount(self, charge):
         return self.benefit.proxy().shipping_discount(charge)
@@ -1,5 +1,7 @@
 from decimal import Decimal as D
 
+from django.utils.functional import cached_property
+
 
 class FeeApplications(object):
     """
@@ -12,7 +14,7 @@ class FeeApplications(object):
     * The number of times the fee was successfully applied
     """
     def __init__(self):
-        self.applications = {}
+        self._entries = []
 
     def __iter__(self):
         return self.applications.values().__iter__()
@@ -21,16 +23,29 @@ class FeeApplications(object):
         return len(self.applications)
 
     def add(self, fee, result):
-        if fee.id not in self.applications:
-            self.applications[fee.id] = {
-                'fee': fee,
-                'result': result,
-                'name': fee.name,
-                'description': fee.description,
-                'freq': 0,
-                'amount': D('0.00')}
-        self.applications[fee.id]['amount'] += result.fee
-        self.applications[fee.id]['freq'] += 1
+        self._entries.append((fee, result))
+        # Group again when the applications are read next
+        self.__dict__.pop('applications', None)
+
+    @cached_property
+    def applications(self):
+        """
+        Return the applications grouped by fee, this is only done once the
+        applications are actually read.
+        """
+        applications = {}
+        for fee, result in self._entries:
+            if fee.id not in applications:
+                applications[fee.id] = {
+                    'fee': fee,
+                    'result': result,
+                    'name': fee.name,
+                    'description': fee.description,
+                    'freq': 0,
+                    'amount': D('0.00')}
+            applications[fee.id]['amount'] += result.fee
+            applications[fee.id]['freq'] += 1
+        return applications
 
     @property
     def fees(self):
@@ -0,0 +1,109 @@
+from decimal import Decimal as D
+from decimal import ROUND_DOWN
+
+_ZERO = D('0.00')
+_CENT = D('0.01')
+
+
+def round_down_to_cent(amount):
+    """
+    The default rounding of fee amounts, see Fee.round
+    """
+    return amount.quantize(_CENT, ROUND_DOWN)
+
+
+def get_fee_amount(line):
+    """
+    Return the fee amount applied to the passed line
+    """
+    attrs = line.__dict__
+    return (D(attrs.get('_fee_cents', 0)) / 100).quantize(_CENT) + \
+        attrs.get('_fee_amount', _ZERO)
+
+
+def reset_line_fees(line):
+    """
+    Clear the fees applied to the passed line
+    """
+    line._fee_amount = _ZERO
+    line._fee_cents = 0
+    line._fee_quantity = 0
+
+
+def apply_fee_to_line(line, line_fee, quantity):
+    """
+    Apply a given discount to the passed line
+    """
+    # Set if not already
+    attrs = line.__dict__
+    attrs['_fee_amount'] = attrs.get('_fee_amount', _ZERO) + line_fee
+    attrs['_fee_quantity'] = attrs.get('_fee_quantity', 0) + int(quantity)
+
+
+def apply_cents_to_line(line, line_fee_cents, quantity):
+    """
+    Apply a given discount in whole cents to the passed line, without any
+    Decimal arithmetic
+    """
+    # Set if not already
+    attrs = line.__dict__
+    attrs['_fee_cents'] = attrs.get('_fee_cents', 0) + line_fee_cents
+    attrs['_fee_quantity'] = attrs.get('_fee_quantity', 0) + int(quantity)
+
+
+def split_fee(fee_amount, quantities, round_fee):
+    """
+    Split a fee over lines with the given quantities, in proportion to the
+    quantity of each line.
+
+    Every line but the last gets its share rounded by ``round_fee``, the last
+    line just takes the difference to ensure that rounding doesn't lead to an
+    off-by-one error.
+    """
+    num_affected = sum(quantities)
+    line_fees = []
+    fee_applied = _ZERO
+    for quantity in quantities[:-1]:
+        line_fee = round_fee((fee_amount * quantity) / num_affected)
+        line_fees.append(line_fee)
+        fee_applied += line_fee
+    line_fees.append(fee_amount - fee_applied)
+    return line_fees
+
+
+def split_fee_cents(fee_cents, quantities):
+    """
+    Split a fee in cents over lines the same way as ``split_fee`` does when
+    rounding down to cents, using integer arithmetic only.
+    """
+    num_affected = sum(quantities)
+    line_fees = []
+    fee_applied = 0
+    for quantity in quantities[:-1]:
+        line_fee = fee_cents * quantity // num_affected
+        line_fees.append(line_fee)
+        fee_applied += line_fee
+    line_fees.append(fee_cents - fee_applied)
+    return line_fees
+
+
+def apply_fee_to_lines(covered_lines, fee_amount, round_fee=None):
+    """
+    Split a fee over the passed ``(line, quantity)`` pairs and apply it.
+
+    Without a custom ``round_fee`` the shares are rounded down to cents,
+    which for whole-cent fees is done in integer cents. A custom rounding
+    may keep sub-cent precision, so its shares are kept as exact Decimals.
+    """
+    quantities = [quantity for line, quantity in covered_lines]
+    if round_fee is None:
+        if fee_amount == fee_amount.quantize(_CENT):
+            line_fees = split_fee_cents(int(fee_amount * 100), quantities)
+            for (line, quantity), line_fee in zip(covered_lines, line_fees):
+                apply_cents_to_line(line, line_fee, quantity)
+            return
+        round_fee = round_down_to_cent
+
+    line_fees = split_fee(fee_amount, quantities, round_fee)
+    for (line, quantity), line_fee in zip(covered_lines, line_fees):
+        apply_fee_to_line(line, line_fee, quantity)
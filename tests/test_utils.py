@@ -0,0 +1,173 @@
+import itertools
+import unittest
+from decimal import Decimal as D
+from decimal import ROUND_DOWN, ROUND_HALF_UP
+
+from django_oscar_fees.utils import (
+    apply_cents_to_line, apply_fee_to_line, apply_fee_to_lines,
+    get_fee_amount, split_fee, split_fee_cents)
+
+
+def round_down(amount):
+    # The default rounding of Fee.round
+    return amount.quantize(D('.01'), ROUND_DOWN)
+
+
+def round_half_up_mills(amount):
+    # A custom OSCAR_OFFER_ROUNDING_FUNCTION keeping sub-cent precision
+    return amount.quantize(D('.001'), ROUND_HALF_UP)
+
+
+def baseline_split(fee_amount, quantities, round_fee):
+    """
+    The proration as originally done in AbsoluteFee.apply, the reference for
+    the integer cent version
+    """
+    num_affected = sum(quantities)
+    line_fees = []
+    fee_applied = D('0.00')
+    for i, quantity in enumerate(quantities):
+        if i == len(quantities) - 1:
+            line_fee = fee_amount - fee_applied
+        else:
+            line_fee = round_fee((fee_amount * quantity) / num_affected)
+        line_fees.append(line_fee)
+        fee_applied += line_fee
+    return line_fees
+
+
+PATHOLOGICAL_QUANTITIES = [
+    [1],
+    [1000],
+    [1, 1],
+    [1, 1, 1],
+    [3, 3],
+    [1, 2, 3],
+    [7, 11, 13],
+    [1, 999],
+    [999, 1],
+    [1] * 50,
+    [1, 1, 1, 1, 1, 1, 1, 1, 1, 91],
+    [2 ** 20, 1, 3],
+]
+
+PATHOLOGICAL_FEES = [
+    D('0.01'), D('0.02'), D('0.03'), D('0.07'), D('0.99'), D('1.00'),
+    D('3.33'), D('10.00'), D('19.99'), D('9999999999.99'),
+]
+
+
+class SplitFeeTest(unittest.TestCase):
+
+    def test_last_line_takes_the_difference(self):
+        self.assertEqual(
+            split_fee(D('1.00'), [1, 1, 1], round_down),
+            [D('0.33'), D('0.33'), D('0.34')])
+
+    def test_lines_are_weighted_by_quantity(self):
+        self.assertEqual(
+            split_fee(D('10.00'), [1, 2, 7], round_down),
+            [D('1.00'), D('2.00'), D('7.00')])
+        self.assertEqual(
+            split_fee(D('0.99'), [1, 999], round_down),
+            [D('0.00'), D('0.99')])
+
+    def test_small_fee_over_many_units(self):
+        # Dividing by the number of units first would give the middle line
+        # nothing at all
+        self.assertEqual(
+            split_fee(D('0.02'), [1, 3, 2], round_down),
+            [D('0.00'), D('0.01'), D('0.01')])
+
+    def test_custom_rounding_keeps_sub_cent_precision(self):
+        self.assertEqual(
+            split_fee(D('1.00'), [1, 1, 1], round_half_up_mills),
+            [D('0.333'), D('0.333'), D('0.334')])
+        self.assertEqual(
+            split_fee(D('0.02'), [1, 3, 2], round_half_up_mills),
+            [D('0.003'), D('0.010'), D('0.007')])
+
+
+class SplitFeeCentsTest(unittest.TestCase):
+
+    def assertMatchesBaseline(self, fee_amount, quantities):
+        fee_cents = int(fee_amount * 100)
+        line_fees = split_fee_cents(fee_cents, quantities)
+        self.assertEqual(
+            [D(cents) / 100 for cents in line_fees],
+            baseline_split(fee_amount, quantities, round_down),
+            (fee_amount, quantities))
+        self.assertEqual(sum(line_fees), fee_cents)
+
+    def test_matches_baseline_for_pathological_quantities(self):
+        for fee_amount, quantities in itertools.product(
+                PATHOLOGICAL_FEES, PATHOLOGICAL_QUANTITIES):
+            self.assertMatchesBaseline(fee_amount, quantities)
+
+    def test_matches_baseline_for_all_small_fees(self):
+        for cents in range(1, 2000):
+            fee_amount = D(cents) / 100
+            for quantities in [[1, 2], [2, 3, 1], [3, 3, 3, 30], [13, 26]]:
+                self.assertMatchesBaseline(fee_amount, quantities)
+
+    def test_small_fee_over_many_units(self):
+        self.assertEqual(split_fee_cents(2, [1, 3, 2]), [0, 1, 1])
+
+
+class Line(object):
+    """
+    Stand-in for a basket line, the fee helpers only set attributes on it
+    """
+
+
+class ApplyFeeToLinesTest(unittest.TestCase):
+
+    def apply(self, fee_amount, quantities, round_fee=None):
+        lines = [Line() for quantity in quantities]
+        apply_fee_to_lines(list(zip(lines, quantities)), fee_amount,
+                           round_fee)
+        return lines
+
+    def assertLinesAddUp(self, fee_amount, quantities, round_fee=None):
+        lines = self.apply(fee_amount, quantities, round_fee)
+        self.assertEqual(
+            sum(get_fee_amount(line) for line in lines), fee_amount,
+            (fee_amount, quantities))
+        self.assertEqual(
+            [line._fee_quantity for line in lines], quantities)
+        return lines
+
+    def test_default_rounding_adds_up_to_the_fee(self):
+        for fee_amount, quantities in itertools.product(
+                PATHOLOGICAL_FEES, PATHOLOGICAL_QUANTITIES):
+            self.assertLinesAddUp(fee_amount, quantities)
+
+    def test_default_rounding_is_stored_in_cents(self):
+        lines = self.assertLinesAddUp(D('1.00'), [1, 1, 1])
+        self.assertEqual([line._fee_cents for line in lines], [33, 33, 34])
+        self.assertEqual(
+            [get_fee_amount(line) for line in lines],
+            [D('0.33'), D('0.33'), D('0.34')])
+
+    def test_default_rounding_of_sub_cent_fee_adds_up(self):
+        self.assertLinesAddUp(D('1.005'), [1, 1, 1])
+
+    def test_custom_rounding_keeps_sub_cent_precision(self):
+        lines = self.assertLinesAddUp(
+            D('1.00'), [1, 1, 1], round_half_up_mills)
+        self.assertEqual(
+            [get_fee_amount(line) for line in lines],
+            [D('0.333'), D('0.333'), D('0.334')])
+
+    def test_custom_rounding_adds_up_to_the_fee(self):
+        for fee_amount, quantities in itertools.product(
+                PATHOLOGICAL_FEES, PATHOLOGICAL_QUANTITIES):
+            self.assertLinesAddUp(fee_amount, quantities, round_half_up_mills)
+
+    def test_fees_accumulate_on_a_line(self):
+        line = Line()
+        apply_fee_to_line(line, D('0.125'), 1)
+        apply_cents_to_line(line, 10, 2)
+        apply_fee_to_line(line, D('0.125'), 1)
+        self.assertEqual(get_fee_amount(line), D('0.35'))
+        self.assertEqual(line._fee_quantity, 4)